@@ -4,7 +4,8 @@ import aiohttp
 import os
 import asyncio
 from config import DISCORD_BOT_TOKEN, get_github_headers
-from utils.persistence import load_data
+from utils.persistence import load_data, load_recent_index
+from utils.recent_index import RecentIndex
 
 
 intents = discord.Intents.default()
@@ -16,6 +17,7 @@ bot = commands.Bot(command_prefix="!", intents=intents, help_command=None)
 # These will hold the bot's state, loaded on startup
 bot.watched_repos = {}
 bot.notified_issues = set()
+bot.recent_index = RecentIndex()
 bot.http_session = None
 
 
@@ -25,6 +27,7 @@ async def on_ready():
     print(f'Logged in as {bot.user.name} ({bot.user.id})')
     
     bot.watched_repos, bot.notified_issues = load_data()
+    bot.recent_index = load_recent_index()
     
     bot.http_session = aiohttp.ClientSession(headers=get_github_headers())
     
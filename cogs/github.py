@@ -1,28 +1,56 @@
 import discord
 from discord.ext import commands, tasks
 import aiohttp
-import asyncio
 from datetime import datetime, timezone, timedelta
-from utils.persistence import save_data
-from config import CHECK_INTERVAL_MINUTES
+from utils.persistence import save_data, save_recent_index
+from utils.label_filter import compile_filter, item_label_pairs
+from utils.pipeline import Pipeline, Stage
+from config import (CHECK_INTERVAL_MINUTES, PIPELINE_QUEUE_SIZE, FETCH_WORKERS,
+                    FETCH_MAX_PAGES, FETCH_INTERVAL_SECONDS, MATCH_WORKERS, DISPATCH_WORKERS)
 
 class GitHubCog(commands.Cog):
     """Cog for handling all GitHub-related commands and tasks."""
     
     def __init__(self, bot):
         self.bot = bot
+        self.label_filters = {}  # repo -> compiled LabelFilter
+        
+        # Each check cycle flows through these stages; the bounded queues make
+        # a slow stage hold back its producers instead of piling up work.
+        self.pipeline = Pipeline(
+            Stage("fetch", self.fetch_stage, workers=FETCH_WORKERS, queue_size=PIPELINE_QUEUE_SIZE,
+                  min_interval=FETCH_INTERVAL_SECONDS),
+            Stage("match", self.match_stage, workers=MATCH_WORKERS, queue_size=PIPELINE_QUEUE_SIZE),
+            Stage("dispatch", self.dispatch_stage, workers=DISPATCH_WORKERS, queue_size=PIPELINE_QUEUE_SIZE),
+            Stage("persist", self.persist_stage, workers=1, queue_size=PIPELINE_QUEUE_SIZE),
+        )
+        self.cycle_run_time = None
+        self.cycle_claimed_issues = set()
+        self.cycle_data_modified = False
+        self.cycle_index_modified = False
+        
         self.check_issues_loop.start()
 
     def cog_unload(self):
         """Called when the cog is unloaded."""
         self.check_issues_loop.cancel()
 
+    def get_label_filter(self, repo, data):
+        """Returns the compiled label filter for a watched repo, compiling it on first use."""
+        label_filter = self.label_filters.get(repo)
+        if label_filter is None:
+            label_filter = compile_filter(data)
+            self.label_filters[repo] = label_filter
+        return label_filter
+
 
     @commands.command(name='watch', 
                       help='Watch a repo for issues, pull requests, or both.\n'
-                           'Usage: `!watch owner/repo [labels...] [--type <type>]`\n'
+                           'Usage: `!watch owner/repo [labels...] [--any <label>] [--not <label>] [--type <type>]`\n'
+                           'Items must have every plain label, at least one `--any` label and no `--not` label.\n'
                            'Types: `issues` (default), `prs`, `all`\n'
                            'Example: `!watch owner/repo "help wanted" --type all`\n'
+                           'Example: `!watch owner/repo --any bug --any "good first issue" --not wontfix`\n'
                            'Example: `!watch owner/repo --type prs`')
     async def watch_repo(self, ctx, repo_name: str, *args: str):
         """Adds a repository to the watch list for the current channel."""
@@ -33,6 +61,8 @@ class GitHubCog(commands.Cog):
             return
 
         labels = []
+        any_labels = []
+        exclude_labels = []
         watch_type = "issues" 
         possible_types = ["issues", "prs", "all"]
         
@@ -47,6 +77,15 @@ class GitHubCog(commands.Cog):
                 else:
                     await ctx.send(f":x: Invalid value for `--type`. Must be `issues`, `prs`, or `all`.")
                     return
+            elif arg.lower() in ("--any", "--not"):
+                if i + 1 < len(args):
+                    target = any_labels if arg.lower() == "--any" else exclude_labels
+                    target.append(args[i+1])
+                    i += 2 # Skip both the flag and its label
+                    continue
+                else:
+                    await ctx.send(f":x: `{arg.lower()}` must be followed by a label.")
+                    return
             else:
                 labels.append(arg)
                 i += 1
@@ -65,8 +104,9 @@ class GitHubCog(commands.Cog):
                     return
 
             valid_labels = [] 
+            all_labels = labels + any_labels + exclude_labels
             
-            if labels: 
+            if all_labels: 
                 await loading_msg.edit(content=f":mag: Verifying labels for `{repo_name}`...")
                 
                 repo_labels_url = f"https://api.github.com/repos/{repo_name}/labels"
@@ -96,7 +136,7 @@ class GitHubCog(commands.Cog):
 
                 
                 invalid_labels = []
-                for user_label in labels:
+                for user_label in all_labels:
                     if user_label.lower() not in repo_label_names:
                         invalid_labels.append(f"`{user_label}`")
                     else:
@@ -108,7 +148,7 @@ class GitHubCog(commands.Cog):
                     return
                 
                 if not valid_labels:
-                    if labels:
+                    if all_labels:
                         await loading_msg.edit(content=f":x: Error: No valid labels were provided, but you specified some.")
                         return
             
@@ -118,10 +158,13 @@ class GitHubCog(commands.Cog):
             
             self.bot.watched_repos[repo_name] = {
                 "channel_id": channel_id,
-                "labels": valid_labels, 
+                "labels": labels, 
+                "any_labels": any_labels,
+                "exclude_labels": exclude_labels,
                 "watch_since_time": start_time_iso,
                 "watch_type": watch_type
             }
+            self.label_filters[repo_name] = compile_filter(self.bot.watched_repos[repo_name])
             
             save_data(self.bot.watched_repos, self.bot.notified_issues)
             
@@ -133,7 +176,7 @@ class GitHubCog(commands.Cog):
             }[watch_type]
 
             if valid_labels:
-                label_str = ", ".join([f"`{l}`" for l in valid_labels])
+                label_str = self.format_label_expression(self.bot.watched_repos[repo_name])
                 await loading_msg.edit(content=f":white_check_mark: Now watching `{repo_name}` for new **{type_str}** with labels: {label_str}. \nNotifications will be sent to this channel.")
             else:
                 await loading_msg.edit(content=f":white_check_mark: Now watching `{repo_name}` for **all new {type_str}**. \nNotifications will be sent to this channel.")
@@ -164,7 +207,10 @@ class GitHubCog(commands.Cog):
         
         if repo_name in self.bot.watched_repos:
             del self.bot.watched_repos[repo_name]
+            self.label_filters.pop(repo_name, None)
+            self.bot.recent_index.remove_repo(repo_name)
             save_data(self.bot.watched_repos, self.bot.notified_issues)
+            save_recent_index(self.bot.recent_index)
             await ctx.send(f":x: Stopped watching `{repo_name}`.")
         else:
             await ctx.send(f":grey_question: I am not currently watching `{repo_name}`.")
@@ -197,14 +243,10 @@ class GitHubCog(commands.Cog):
             if channel and channel.guild == ctx.guild:
                 count += 1
                 channel_id = data['channel_id']
-                labels = data['labels']
                 watch_type = data.get("watch_type", "issues") # Default to issues
                 channel_name = f"<#{channel_id}>"
                 
-                if labels:
-                    label_str = ", ".join([f"`{l}`" for l in labels])
-                else:
-                    label_str = "**All**"
+                label_str = self.format_label_expression(data) or "**All**"
                 
                 # Try to get a formatted time string
                 time_str = " (Time not set)"
@@ -234,159 +276,402 @@ class GitHubCog(commands.Cog):
         embed.description = description
         await ctx.send(embed=embed)
 
-    
+    def find_watched_repo(self, repo_name, guild):
+        """Returns the repo watched in `guild` matching `repo_name` case-insensitively, or None."""
+        for repo, data in self.bot.watched_repos.items():
+            if repo.lower() != repo_name.lower():
+                continue
+            # Only expose repos watched in this server, like !list
+            channel = self.bot.get_channel(data['channel_id'])
+            if channel and channel.guild == guild:
+                return repo
+        return None
+
+    def format_label_expression(self, data):
+        """Formats a watch's label expression for display, or returns an empty string if it has none."""
+        parts = []
+        if data.get('labels'):
+            parts.append(" and ".join([f"`{l}`" for l in data['labels']]))
+        if data.get('any_labels'):
+            parts.append("any of " + ", ".join([f"`{l}`" for l in data['any_labels']]))
+        if data.get('exclude_labels'):
+            parts.append("none of " + ", ".join([f"`{l}`" for l in data['exclude_labels']]))
+        return "; ".join(parts)
+
+    @commands.command(name='recent',
+                      help='Show recently seen open issues and PRs for a watched repo.\n'
+                           'Usage: `!recent owner/repo [count] [--type <type>]`\n'
+                           'Types: `issues`, `prs`, `all` (default)\n'
+                           'Answers from items the bot has already fetched, without calling GitHub.\n'
+                           'Example: `!recent owner/repo 5 --type prs`')
+    async def recent_items(self, ctx, repo_name: str, *args: str):
+        """Lists the most recently seen items for a repo from the local index."""
+        repo_name = repo_name.strip()
+
+        count = 10
+        watch_type = "all"
+        possible_types = ["issues", "prs", "all"]
+
+        i = 0
+        while i < len(args):
+            arg = args[i]
+            if arg.lower() == "--type":
+                if i + 1 < len(args) and args[i+1].lower() in possible_types:
+                    watch_type = args[i+1].lower()
+                    i += 2
+                    continue
+                else:
+                    await ctx.send(f":x: Invalid value for `--type`. Must be `issues`, `prs`, or `all`.")
+                    return
+            elif arg.isdigit():
+                count = max(1, min(int(arg), 25))
+                i += 1
+            else:
+                await ctx.send(f":x: Unexpected argument `{arg}`. \nUsage: `!recent owner/repo [count] [--type <type>]`")
+                return
+
+        watched_repo = self.find_watched_repo(repo_name, ctx.guild)
+        if watched_repo is None:
+            await ctx.send(f":grey_question: I am not currently watching `{repo_name}` in this server.")
+            return
+        repo_name = watched_repo
+
+        entries = self.bot.recent_index.recent(repo_name, limit=count, watch_type=watch_type)
+        if not entries:
+            await ctx.send(f":grey_question: I haven't seen any matching open items for `{repo_name}` yet.")
+            return
+
+        embed = self.build_index_embed(f"Recent items in {repo_name}", entries)
+        await ctx.send(embed=embed)
+
+    @recent_items.error
+    async def recent_items_error(self, ctx, error):
+        """Error handler for the !recent command."""
+        if isinstance(error, commands.MissingRequiredArgument):
+            if error.param.name == 'repo_name':
+                await ctx.send(f":warning: You forgot the repository name! \nUsage: `!recent owner/repo`")
+        else:
+            await ctx.send(f":x: An error occurred: {error}")
+            raise error
+
+    @commands.command(name='find',
+                      help='Find recently seen open issues and PRs that have all the given labels.\n'
+                           'Usage: `!find owner/repo labels... [--type <type>]`\n'
+                           'Types: `issues`, `prs`, `all` (default)\n'
+                           'Answers from items the bot has already fetched, without calling GitHub.\n'
+                           'Example: `!find owner/repo "help wanted" bug`')
+    async def find_items(self, ctx, repo_name: str, *args: str):
+        """Finds indexed items for a repo by label from the local index."""
+        repo_name = repo_name.strip()
+
+        labels = []
+        watch_type = "all"
+        possible_types = ["issues", "prs", "all"]
+
+        i = 0
+        while i < len(args):
+            arg = args[i]
+            if arg.lower() == "--type":
+                if i + 1 < len(args) and args[i+1].lower() in possible_types:
+                    watch_type = args[i+1].lower()
+                    i += 2
+                    continue
+                else:
+                    await ctx.send(f":x: Invalid value for `--type`. Must be `issues`, `prs`, or `all`.")
+                    return
+            else:
+                labels.append(arg)
+                i += 1
+
+        if not labels:
+            await ctx.send(f":warning: You need to give at least one label! \nUsage: `!find owner/repo \"label one\"`")
+            return
+
+        watched_repo = self.find_watched_repo(repo_name, ctx.guild)
+        if watched_repo is None:
+            await ctx.send(f":grey_question: I am not currently watching `{repo_name}` in this server.")
+            return
+        repo_name = watched_repo
+
+        entries = self.bot.recent_index.find(repo_name, labels, limit=25, watch_type=watch_type)
+        label_str = ", ".join([f"`{l}`" for l in labels])
+        if not entries:
+            await ctx.send(f":grey_question: I haven't seen any open items in `{repo_name}` with labels: {label_str}")
+            return
+
+        embed = self.build_index_embed(f"Items in {repo_name}", entries)
+        embed.set_footer(text=f"Labels: {', '.join(labels)}")
+        await ctx.send(embed=embed)
+
+    @find_items.error
+    async def find_items_error(self, ctx, error):
+        """Error handler for the !find command."""
+        if isinstance(error, commands.MissingRequiredArgument):
+            if error.param.name == 'repo_name':
+                await ctx.send(f":warning: You forgot the repository name! \nUsage: `!find owner/repo \"label one\"`")
+        else:
+            await ctx.send(f":x: An error occurred: {error}")
+            raise error
+
+    def build_index_embed(self, title, entries):
+        """Builds an embed listing entries from the recent-items index."""
+        embed = discord.Embed(title=title, color=discord.Color.blue())
+
+        description = ""
+        for entry in entries:
+            kind = "PR" if entry['is_pr'] else "Issue"
+            line = f"**[#{entry['number']}]({entry['html_url']})** ({kind}) {entry['title']}\n"
+            if entry['labels']:
+                line += "• " + ", ".join([f"`{l}`" for l in entry['labels']]) + "\n"
+            # Discord caps embed descriptions at 4096 characters
+            if len(description) + len(line) > 4000:
+                break
+            description += line
+
+        embed.description = description
+        return embed
+
+
     @tasks.loop(minutes=CHECK_INTERVAL_MINUTES)
     async def check_issues_loop(self):
         """The main background loop that checks GitHub for new issues."""
         
-        current_run_time_utc = datetime.now(timezone.utc)
         print(f"[{datetime.now()}] Running GitHub check...")
         
         if not self.bot.watched_repos:
             print("No repos to watch. Skipping check.")
             return
 
-        base_params = {"state": "open", "sort": "updated", "direction": "desc"}
+        # Per-cycle state shared by the pipeline stages
+        self.cycle_run_time = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+        self.cycle_claimed_issues = set()
+        self.cycle_data_modified = False
+        self.cycle_index_modified = False
+
+        await self.pipeline.run(list(self.bot.watched_repos.items()))
         
-        current_notified_issues = set(self.bot.notified_issues)
-        repos_to_remove = []
-        data_was_modified = False
+        # Only save if we actually need to
+        if self.cycle_data_modified:
+            save_data(self.bot.watched_repos, self.bot.notified_issues)
+        if self.cycle_index_modified:
+            save_recent_index(self.bot.recent_index)
+        
+        print("GitHub check finished.")
 
-        for repo, data in list(self.bot.watched_repos.items()):
-            channel_id = data['channel_id']
-            labels = data['labels']
-            watch_type = data.get("watch_type", "issues") 
-            
-            params = base_params.copy()
-            
-            if labels:
-                params["labels"] = ",".join(labels)
-            
-            repo_since_time = data.get('watch_since_time')
-            
-            if repo_since_time:
-                try:
-                    since_dt = datetime.fromisoformat(repo_since_time.replace('Z', '+00:00'))
-                    since_dt_buffered = since_dt - timedelta(seconds=1)
-                    params["since"] = since_dt_buffered.isoformat().replace('+00:00', 'Z')
-                except ValueError:
-                    print(f"  - Error: Invalid time format for {repo}: {repo_since_time}. Fetching all.")
-                    # Fallback: Don't use 'since' this time if format is bad
-            else:
-                # This is an old entry from before we tracked time.
-                print(f"  - No 'watch_since_time' for {repo}. Fetching all and setting time for next run.")
-                data_was_modified = True # Mark to save the new time
-            
-            url = f"https://api.github.com/repos/{repo}/issues"
-            
-            
-            type_log_str = {
-                "issues": "issues only",
-                "prs": "PRs only",
-                "all": "issues and PRs"
-            }[watch_type]
-            if labels:
-                print(f"  - Checking {repo} for {type_log_str} with labels: {params['labels']}")
-            else:
-                print(f"  - Checking {repo} for all new {type_log_str}")
-            
-                
-            if 'since' in params:
-                print(f"  - Checking for items updated since: {params['since']}")
-            
+    async def fetch_stage(self, job):
+        """Pipeline stage: fetches recently updated items for one watched repo, page by page."""
+        repo, data = job
+        watch_type = data.get("watch_type", "issues") 
+        label_filter = self.get_label_filter(repo, data)
+        
+        # Labels are matched locally by each watch's compiled filter, so one
+        # unfiltered query per repo covers any-of/all-of/none-of expressions.
+        # Closed items are fetched too so the recent index can drop them.
+        # Oldest updates come first, so a walk cut short can resume where it stopped.
+        params = {"state": "all", "sort": "updated", "direction": "asc", "per_page": 100}
+        max_pages = FETCH_MAX_PAGES
+        
+        repo_since_time = data.get('watch_since_time')
+        
+        if repo_since_time:
             try:
+                since_dt = datetime.fromisoformat(repo_since_time.replace('Z', '+00:00'))
+                since_dt_buffered = since_dt - timedelta(seconds=1)
+                params["since"] = since_dt_buffered.isoformat().replace('+00:00', 'Z')
+            except ValueError:
+                print(f"  - Error: Invalid time format for {repo}: {repo_since_time}. Fetching latest items only.")
+        else:
+            # This is an old entry from before we tracked time.
+            print(f"  - No 'watch_since_time' for {repo}. Fetching latest items only and setting time for next run.")
+        
+        if "since" not in params:
+            # Without a time window, read one page of the latest open items rather
+            # than walking the repo's whole history, and start a window from now.
+            params = {"state": "open", "sort": "updated", "direction": "desc", "per_page": 100}
+            max_pages = 1
+        
+        url = f"https://api.github.com/repos/{repo}/issues"
+        
+        type_log_str = {
+            "issues": "issues only",
+            "prs": "PRs only",
+            "all": "issues and PRs"
+        }[watch_type]
+        if not label_filter.is_empty:
+            print(f"  - Checking {repo} for {type_log_str} with labels: {self.format_label_expression(data)}")
+        else:
+            print(f"  - Checking {repo} for all new {type_log_str}")
+        
+        if 'since' in params:
+            print(f"  - Checking for items updated since: {params['since']}")
+        
+        items_found = 0
+        last_updated_at = None
+        fetch_complete = False
+        page = 1
+        
+        try:
+            # Page through everything updated since the last check so busy repos don't lose items
+            while page <= max_pages:
+                params["page"] = page
+                # Every page is a request, so each one waits for its own rate-limit slot
+                await self.pipeline.throttle("fetch")
                 async with self.bot.http_session.get(url, params=params) as response:
+                    status = response.status
+                    page_items = await response.json() if status == 200 else None
+                
+                if status == 200:
+                    if page_items:
+                        items_found += len(page_items)
+                        last_updated_at = page_items[-1]['updated_at']
+                        # Hand each page on as soon as it arrives. The watch time is passed
+                        # along because the persist stage may advance it before match runs.
+                        await self.pipeline.put("match", (repo, data, repo_since_time, page_items))
                     
-                    if response.status == 200:
-                        items = await response.json() 
-                        if not items:
-                            print(f"  - No matching items found for {repo}.")
-                            continue
-                        
-                        print(f"  - Found {len(items)} matching items for {repo}.")
-                        
-                        for item in items: 
-                            
-                            is_pr = 'pull_request' in item
-
-                            if watch_type == "issues" and is_pr:
-                                print(f"    - Ignoring Pull Request (watching issues only): {repo}#{item['number']}")
-                                continue
-                            elif watch_type == "prs" and not is_pr:
-                                print(f"    - Ignoring Issue (watching PRs only): {repo}#{item['number']}")
-                                continue
-
-                            issue_id = f"{repo}#{item['number']}"
-                            issue_created_at = datetime.fromisoformat(item['created_at'].replace('Z', '+00:00'))
-                            
-                            watch_started_at = None
-                            if repo_since_time:
-                                try:
-                                    watch_started_at = datetime.fromisoformat(repo_since_time.replace('Z', '+00:00'))
-                                except ValueError:
-                                    pass 
-                            
-                            passes_newness_check = issue_id not in self.bot.notified_issues
-                            
-                            passes_time_check = True 
-                            if watch_started_at:
-                                passes_time_check = (issue_created_at >= watch_started_at)
-                            else:
-                                print(f"    - No watch_started_at for {issue_id}, relying on notified_issues set.")
-
-                            if passes_newness_check and passes_time_check:
-                                print(f"    - NEW Item Found: {issue_id} (Type: {'PR' if is_pr else 'Issue'})")
-                                current_notified_issues.add(issue_id)
-                                
-                                channel = self.bot.get_channel(channel_id)
-                                if channel:
-                                    await self.send_notification(channel, repo, item, labels, is_pr)
-                                else:
-                                    print(f"    - Error: Channel {channel_id} not found for repo {repo}.")
-                            elif issue_id in self.bot.notified_issues:
-                                print(f"    - Ignoring already notified item: {issue_id}")
-                            else:
-                                if watch_started_at:
-                                    print(f"    - Ignoring old item: {issue_id} (created {issue_created_at}, watching since {watch_started_at})")
-                                else:
-                                    print(f"    - Ignoring old item: {issue_id} (created {issue_created_at}, no watch time set)")
-
+                    # If we received fewer than a full page, this is the last page
+                    if len(page_items) < params["per_page"]:
+                        fetch_complete = True
+                        break
+                    page += 1
+                
+                elif status == 404:
+                    print(f"  - Error: Repository {repo} not found (404).")
+                    channel = self.bot.get_channel(data['channel_id'])
+                    if channel:
+                        warning = f":warning: Repository `{repo}` could not be found. It may have been deleted or renamed. Removing from watch list."
+                        await self.pipeline.put("dispatch", ("warning", channel, warning))
+                    await self.pipeline.put("persist", ("remove", repo))
+                    return
+                
+                else:
+                    print(f"  - Error: GitHub API returned {status} for {repo} (page {page}).")
+                    break
                     
-                    elif response.status == 404:
-                        print(f"  - Error: Repository {repo} not found (404).")
-                        channel = self.bot.get_channel(channel_id)
-                        if channel:
-                            await channel.send(f":warning: Repository `{repo}` could not be found. It may have been deleted or renamed. Removing from watch list.")
-                        repos_to_remove.append(repo)
-
-                    else:
-                        print(f"  - Error: GitHub API returned {response.status} for {repo}.")
-                        
-            except aiohttp.ClientError as e:
-                print(f"  - Error: Network or client error checking {repo}: {e}")
+        except aiohttp.ClientError as e:
+            print(f"  - Error: Network or client error checking {repo}: {e}")
+        
+        if items_found:
+            print(f"  - Found {items_found} items for {repo}.")
+        elif fetch_complete:
+            print(f"  - No items found for {repo}.")
+        
+        if fetch_complete or "since" not in params:
+            # Update this repo's check time to the time this cycle *started*.
+            await self.pipeline.put("persist", ("checked", repo, self.cycle_run_time))
+        elif last_updated_at:
+            # The walk stopped early (page limit or an error). Items come oldest update
+            # first, so resume next cycle from the last one we got instead of redoing the window.
+            print(f"  - Stopped after {items_found} items for {repo}; continuing next check.")
+            await self.pipeline.put("persist", ("checked", repo, last_updated_at))
+
+    async def match_stage(self, job):
+        """Pipeline stage: filters one fetched page of a repo's items down to new notifications."""
+        repo, data, repo_since_time, items = job
+        channel_id = data['channel_id']
+        watch_type = data.get("watch_type", "issues") 
+        label_filter = self.get_label_filter(repo, data)
+        
+        # Index everything we fetched so !recent and !find can answer locally
+        await self.pipeline.put("persist", ("index", repo, items))
+        
+        watch_started_at = None
+        if repo_since_time:
+            try:
+                watch_started_at = datetime.fromisoformat(repo_since_time.replace('Z', '+00:00'))
+            except ValueError:
+                pass 
+        
+        for item in items: 
+            is_pr = 'pull_request' in item
+
+            if item.get('state') != 'open':
+                print(f"    - Ignoring closed item: {repo}#{item['number']}")
+                continue
+
+            if watch_type == "issues" and is_pr:
+                print(f"    - Ignoring Pull Request (watching issues only): {repo}#{item['number']}")
+                continue
+            elif watch_type == "prs" and not is_pr:
+                print(f"    - Ignoring Issue (watching PRs only): {repo}#{item['number']}")
+                continue
+
+            label_pairs = item_label_pairs(item)
+            item_labels = frozenset(key for _, key in label_pairs)
+            if not label_filter.matches(item_labels):
+                print(f"    - Ignoring item without matching labels: {repo}#{item['number']}")
+                continue
+
+            issue_id = f"{repo}#{item['number']}"
+            issue_created_at = datetime.fromisoformat(item['created_at'].replace('Z', '+00:00'))
             
-            # Update this repo's check time to the time this loop *started*.
-            if self.bot.watched_repos.get(repo): # Check if it wasn't deleted
-                self.bot.watched_repos[repo]['watch_since_time'] = current_run_time_utc.isoformat().replace('+00:00', 'Z')
-                data_was_modified = True
+            passes_newness_check = (issue_id not in self.bot.notified_issues
+                                    and issue_id not in self.cycle_claimed_issues)
             
-            await asyncio.sleep(2) 
+            passes_time_check = True 
+            if watch_started_at:
+                passes_time_check = (issue_created_at >= watch_started_at)
+            else:
+                print(f"    - No watch_started_at for {issue_id}, relying on notified_issues set.")
 
-        for repo in repos_to_remove:
-            if repo in self.bot.watched_repos:
-                del self.bot.watched_repos[repo]
-                data_was_modified = True 
+            if passes_newness_check and passes_time_check:
+                print(f"    - NEW Item Found: {issue_id} (Type: {'PR' if is_pr else 'Issue'})")
+                self.cycle_claimed_issues.add(issue_id)
                 
-        self.bot.notified_issues.update(current_notified_issues)
-        
-        # Only save if we actually need to
-        if data_was_modified:
-            save_data(self.bot.watched_repos, self.bot.notified_issues)
-        
-        print("GitHub check finished.")
+                channel = self.bot.get_channel(channel_id)
+                if channel:
+                    await self.pipeline.put("dispatch", ("notify", channel, repo, item, label_filter, label_pairs, is_pr, issue_id))
+                else:
+                    print(f"    - Error: Channel {channel_id} not found for repo {repo}.")
+                    await self.pipeline.put("persist", ("notified", issue_id))
+            elif not passes_newness_check:
+                print(f"    - Ignoring already notified item: {issue_id}")
+            else:
+                if watch_started_at:
+                    print(f"    - Ignoring old item: {issue_id} (created {issue_created_at}, watching since {watch_started_at})")
+                else:
+                    print(f"    - Ignoring old item: {issue_id} (created {issue_created_at}, no watch time set)")
 
+    async def dispatch_stage(self, job):
+        """Pipeline stage: sends one message to Discord."""
+        if job[0] == "warning":
+            _, channel, message = job
+            await channel.send(message)
+            return
+        
+        _, channel, repo, item, label_filter, label_pairs, is_pr, issue_id = job
+        await self.send_notification(channel, repo, item, label_filter, label_pairs, is_pr)
+        await self.pipeline.put("persist", ("notified", issue_id))
+
+    async def persist_stage(self, job):
+        """Pipeline stage: applies one update to the bot's shared state.
+
+        This stage runs a single worker so all state changes during a cycle
+        happen in one place; the files are written once the pipeline drains.
+        """
+        kind = job[0]
+        if kind == "index":
+            _, repo, items = job
+            for item in items:
+                self.bot.recent_index.add(repo, item)
+            self.cycle_index_modified = True
+        elif kind == "notified":
+            self.bot.notified_issues.add(job[1])
+            self.cycle_data_modified = True
+        elif kind == "checked":
+            _, repo, checked_until = job
+            if self.bot.watched_repos.get(repo): # Check if it wasn't deleted
+                self.bot.watched_repos[repo]['watch_since_time'] = checked_until
+                self.cycle_data_modified = True
+        elif kind == "remove":
+            repo = job[1]
+            if repo in self.bot.watched_repos:
+                del self.bot.watched_repos[repo]
+                self.label_filters.pop(repo, None)
+                self.bot.recent_index.remove_repo(repo)
+                self.cycle_data_modified = True
+                self.cycle_index_modified = True
 
-    async def send_notification(self, channel, repo, issue, watched_labels, is_pr):
+    async def send_notification(self, channel, repo, issue, label_filter, label_pairs, is_pr):
         """Formats and sends a single issue notification to a channel."""
         
         # Simplify the title per your request
@@ -409,15 +694,11 @@ class GitHubCog(commands.Cog):
         
         embed.add_field(name="Created By", value=f"[{issue['user']['login']}]({issue['user']['html_url']})", inline=True)
         
-        issue_labels = [label['name'] for label in issue['labels']]
-        
         # Only highlight labels if we are watching for specific ones
-        if watched_labels:
-            watched_label_set_lower = set(l.lower() for l in watched_labels)
-            
+        if label_filter.highlighted:
             formatted_labels = []
-            for name in issue_labels:
-                if name.lower() in watched_label_set_lower:
+            for name, key in label_pairs:
+                if key in label_filter.highlighted:
                     formatted_labels.append(f"**`{name}`** :star:") # Highlights the label that matched
                 else:
                     formatted_labels.append(f"`{name}`")
@@ -425,9 +706,9 @@ class GitHubCog(commands.Cog):
             if formatted_labels:
                 embed.add_field(name="Labels", value=', '.join(formatted_labels), inline=False)
         
-        elif issue_labels:
+        elif label_pairs:
             # If we're watching ALL issues, just list the labels without highlighting
-            formatted_labels = [f"`{name}`" for name in issue_labels]
+            formatted_labels = [f"`{name}`" for name, _ in label_pairs]
             embed.add_field(name="Labels", value=', '.join(formatted_labels), inline=False)
             
         
@@ -13,6 +13,20 @@ CHECK_INTERVAL_MINUTES = 15
 
 
 DATA_FILE_PATH = os.environ.get("DATA_FILE_PATH", "bot_data.json")
+RECENT_INDEX_FILE_PATH = os.environ.get("RECENT_INDEX_FILE_PATH", "recent_index.json")
+
+# Maximum number of recently seen issues/PRs kept per repo for !recent and !find
+RECENT_INDEX_MAX_ITEMS = 200
+
+# Worker counts and queue size for the fetch -> match -> dispatch -> persist check pipeline
+FETCH_WORKERS = 3
+# Most pages (of 100 items) read per repo per check; the rest are picked up next cycle
+FETCH_MAX_PAGES = 5
+# Minimum spacing between GitHub requests (shared by all fetch workers) to stay friendly with the rate limit
+FETCH_INTERVAL_SECONDS = 2
+MATCH_WORKERS = 1
+DISPATCH_WORKERS = 2
+PIPELINE_QUEUE_SIZE = 50
 
 def get_github_headers():
     """Constructs the headers for GitHub API calls."""
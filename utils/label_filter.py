@@ -0,0 +1,49 @@
+import sys
+
+def intern_label(name):
+    """Returns the shared (interned) lowercase string for a label name."""
+    return sys.intern(name.lower())
+
+def item_label_pairs(item):
+    """Returns (display name, interned lowercase key) pairs for a raw GitHub API item's labels."""
+    return tuple((label['name'], intern_label(label['name'])) for label in item['labels'])
+
+
+class LabelFilter:
+    """A watch's label expression compiled into precomputed label sets.
+
+    An item matches when it has every `all_of` label, at least one
+    `any_of` label (if any are given) and none of the `none_of` labels.
+    """
+
+    __slots__ = ("all_of", "any_of", "none_of", "highlighted")
+
+    def __init__(self, all_of=(), any_of=(), none_of=()):
+        self.all_of = frozenset(intern_label(l) for l in all_of)
+        self.any_of = frozenset(intern_label(l) for l in any_of)
+        self.none_of = frozenset(intern_label(l) for l in none_of)
+        # Labels worth starring in a notification when an item has them
+        self.highlighted = self.all_of | self.any_of
+
+    @property
+    def is_empty(self):
+        return not (self.all_of or self.any_of or self.none_of)
+
+    def matches(self, labels):
+        """Checks a set of interned lowercase labels (see `item_label_pairs`) against the filter."""
+        if self.all_of and not self.all_of <= labels:
+            return False
+        if self.any_of and self.any_of.isdisjoint(labels):
+            return False
+        if self.none_of and not self.none_of.isdisjoint(labels):
+            return False
+        return True
+
+
+def compile_filter(watch_data):
+    """Compiles the label expression stored in a watched repo's data."""
+    return LabelFilter(
+        all_of=watch_data.get("labels", []),
+        any_of=watch_data.get("any_labels", []),
+        none_of=watch_data.get("exclude_labels", []),
+    )
@@ -1,6 +1,7 @@
 import json
 import os
-from config import DATA_FILE_PATH
+from config import DATA_FILE_PATH, RECENT_INDEX_FILE_PATH
+from utils.recent_index import RecentIndex
 
 def load_data():
     """Loads the watch list and notified issues from the JSON file."""
@@ -72,3 +73,22 @@ def save_data(watched_repos, notified_issues):
     except IOError as e:
         print(f"Error saving data: {e}")
 
+def load_recent_index():
+    """Loads the recent-items index from its JSON file."""
+    if os.path.exists(RECENT_INDEX_FILE_PATH):
+        try:
+            with open(RECENT_INDEX_FILE_PATH, 'r') as f:
+                index = RecentIndex.from_dict(json.load(f))
+            print(f"Loaded recent index from {RECENT_INDEX_FILE_PATH}")
+            return index
+        except Exception as e:
+            print(f"Error reading {RECENT_INDEX_FILE_PATH}: {e}. Starting with an empty index.")
+    return RecentIndex()
+
+def save_recent_index(recent_index):
+    """Saves the recent-items index to its JSON file in compact form."""
+    try:
+        with open(RECENT_INDEX_FILE_PATH, 'w') as f:
+            json.dump(recent_index.to_dict(), f, separators=(',', ':'))
+    except IOError as e:
+        print(f"Error saving recent index: {e}")
@@ -0,0 +1,119 @@
+import asyncio
+import time
+
+
+class Stage:
+    """One pipeline stage: a bounded queue drained by a fixed number of workers.
+
+    Handlers that talk to rate-limited APIs call `throttle` before each
+    request; it spaces requests at least `min_interval` apart across all
+    workers. Time spent waiting there is counted as throttled, not busy.
+    """
+
+    def __init__(self, name, handler, workers=1, queue_size=0, min_interval=0):
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.min_interval = min_interval
+        self.next_start = 0.0
+        self.task_throttled = {}  # worker task -> throttled seconds during its current item
+
+        # Timing counters, reset for every run
+        self.processed = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.blocked_seconds = 0.0  # Time producers spent waiting on a full queue
+        self.throttled_seconds = 0.0
+        self.max_depth = 0
+
+    def reset_stats(self):
+        self.processed = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.blocked_seconds = 0.0
+        self.throttled_seconds = 0.0
+        self.max_depth = 0
+
+    async def put(self, item):
+        """Queues an item for this stage, waiting while the queue is full."""
+        start = time.perf_counter()
+        await self.queue.put(item)
+        self.blocked_seconds += time.perf_counter() - start
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+
+    async def throttle(self):
+        """Waits until at least `min_interval` has passed since the previous request started."""
+        now = time.monotonic()
+        start_at = max(now, self.next_start)
+        self.next_start = start_at + self.min_interval
+        if start_at > now:
+            await asyncio.sleep(start_at - now)
+            waited = start_at - now
+            self.throttled_seconds += waited
+            task = asyncio.current_task()
+            self.task_throttled[task] = self.task_throttled.get(task, 0.0) + waited
+
+    async def worker(self):
+        task = asyncio.current_task()
+        while True:
+            item = await self.queue.get()
+            start = time.perf_counter()
+            try:
+                await self.handler(item)
+            except Exception as e:
+                self.errors += 1
+                print(f"  - Error in {self.name} stage: {e}")
+            finally:
+                throttled = self.task_throttled.pop(task, 0.0)
+                self.busy_seconds += time.perf_counter() - start - throttled
+                self.processed += 1
+                self.queue.task_done()
+
+    def summary(self):
+        return (f"{self.name}: {self.processed} items, {self.workers} workers, "
+                f"busy {self.busy_seconds:.2f}s, throttled {self.throttled_seconds:.2f}s, "
+                f"blocked {self.blocked_seconds:.2f}s, "
+                f"max queue {self.max_depth}, errors {self.errors}")
+
+
+class Pipeline:
+    """Runs items through stages connected by bounded queues.
+
+    Stages must be given in order: a handler may only put items into its
+    own stage or later ones, which lets `run` drain the queues front to back.
+    """
+
+    def __init__(self, *stages):
+        self.stages = {stage.name: stage for stage in stages}
+
+    async def put(self, stage_name, item):
+        """Hands an item to a stage, applying backpressure if its queue is full."""
+        await self.stages[stage_name].put(item)
+
+    async def throttle(self, stage_name):
+        """Waits for the named stage's next request slot (see `Stage.throttle`)."""
+        await self.stages[stage_name].throttle()
+
+    async def run(self, items):
+        """Feeds `items` into the first stage and waits until every stage is idle."""
+        stages = list(self.stages.values())
+        for stage in stages:
+            stage.reset_stats()
+
+        tasks = [asyncio.create_task(stage.worker())
+                 for stage in stages for _ in range(stage.workers)]
+        try:
+            for item in items:
+                await stages[0].put(item)
+            # Upstream stages are finished once their queue joins, so each
+            # later queue can only receive work before its own join returns.
+            for stage in stages:
+                await stage.queue.join()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        for stage in stages:
+            print(f"  - {stage.summary()}")
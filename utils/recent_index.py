@@ -0,0 +1,134 @@
+from config import RECENT_INDEX_MAX_ITEMS
+
+# Order of the fields when an entry is stored as a compact list on disk
+ENTRY_FIELDS = ("number", "title", "html_url", "is_pr", "author", "created_at", "updated_at", "labels")
+
+
+class RecentIndex:
+    """Bounded per-repo index of recently seen open issues and PRs.
+
+    Items are keyed by number and by lowercase label name, so lookups
+    can be answered without calling the GitHub API. Ordering and eviction
+    go by each item's `updated_at`, so the order items arrive in doesn't matter.
+    """
+
+    def __init__(self, max_items=RECENT_INDEX_MAX_ITEMS):
+        self.max_items = max_items
+        self.items = {}        # repo -> {number: entry}
+        self.label_index = {}  # repo -> {label_lower: set(numbers)}
+
+    def add(self, repo, item):
+        """Adds or refreshes a raw GitHub API item, dropping it once it is closed."""
+        if item.get('state', 'open') != 'open':
+            self.discard(repo, item['number'])
+            return
+
+        entry = {
+            "number": item['number'],
+            "title": item['title'],
+            "html_url": item['html_url'],
+            "is_pr": 'pull_request' in item,
+            "author": item['user']['login'],
+            "created_at": item['created_at'],
+            "updated_at": item.get('updated_at') or item['created_at'],
+            "labels": [label['name'] for label in item['labels']],
+        }
+        self._insert(repo, entry)
+
+    def _insert(self, repo, entry):
+        repo_items = self.items.setdefault(repo, {})
+        repo_labels = self.label_index.setdefault(repo, {})
+        number = entry['number']
+
+        if number in repo_items:
+            self._unlink_labels(repo, repo_items.pop(number))
+
+        repo_items[number] = entry
+        for name in entry['labels']:
+            repo_labels.setdefault(name.lower(), set()).add(number)
+
+        # Evict the least recently updated items once the repo is over its limit
+        while len(repo_items) > self.max_items:
+            old_entry = min(repo_items.values(), key=lambda e: e['updated_at'])
+            del repo_items[old_entry['number']]
+            self._unlink_labels(repo, old_entry)
+
+    def _unlink_labels(self, repo, entry):
+        repo_labels = self.label_index.get(repo, {})
+        for name in entry['labels']:
+            numbers = repo_labels.get(name.lower())
+            if numbers is None:
+                continue
+            numbers.discard(entry['number'])
+            if not numbers:
+                del repo_labels[name.lower()]
+
+    def discard(self, repo, number):
+        """Drops a single item from the index if it is present."""
+        entry = self.items.get(repo, {}).pop(number, None)
+        if entry is not None:
+            self._unlink_labels(repo, entry)
+
+    def remove_repo(self, repo):
+        """Drops everything indexed for a repo."""
+        self.items.pop(repo, None)
+        self.label_index.pop(repo, None)
+
+    def recent(self, repo, limit=10, watch_type="all"):
+        """Returns up to `limit` items for a repo, most recently updated first."""
+        results = []
+        for entry in self._newest_first(self.items.get(repo, {}).values()):
+            if not self._matches_type(entry, watch_type):
+                continue
+            results.append(entry)
+            if len(results) >= limit:
+                break
+        return results
+
+    def find(self, repo, labels, limit=10, watch_type="all"):
+        """Returns items that carry every one of `labels`, most recently updated first."""
+        repo_items = self.items.get(repo, {})
+        repo_labels = self.label_index.get(repo, {})
+
+        number_sets = [repo_labels.get(l.lower(), set()) for l in labels]
+        if not number_sets:
+            return []
+        matching = set.intersection(*number_sets)
+
+        results = []
+        for entry in self._newest_first(repo_items[number] for number in matching):
+            if not self._matches_type(entry, watch_type):
+                continue
+            results.append(entry)
+            if len(results) >= limit:
+                break
+        return results
+
+    @staticmethod
+    def _newest_first(entries):
+        # updated_at values share GitHub's ISO 8601 format, so they sort as strings
+        return sorted(entries, key=lambda e: e['updated_at'], reverse=True)
+
+    @staticmethod
+    def _matches_type(entry, watch_type):
+        if watch_type == "issues":
+            return not entry['is_pr']
+        if watch_type == "prs":
+            return entry['is_pr']
+        return True
+
+    def to_dict(self):
+        """Serializes the index as compact lists."""
+        return {
+            repo: [[entry[field] for field in ENTRY_FIELDS] for entry in repo_items.values()]
+            for repo, repo_items in self.items.items()
+        }
+
+    @classmethod
+    def from_dict(cls, data, max_items=RECENT_INDEX_MAX_ITEMS):
+        """Rebuilds an index from the output of `to_dict`."""
+        index = cls(max_items=max_items)
+        for repo, rows in data.items():
+            for row in rows:
+                index._insert(repo, dict(zip(ENTRY_FIELDS, row)))
+        return index